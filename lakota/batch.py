@@ -1,3 +1,5 @@
+from threading import Lock
+
 from .changelog import phi
 from .commit import Commit
 
@@ -13,46 +15,74 @@ __all__ = ["Batch"]
 
 
 class Batch:
+    __slots__ = (
+        "collection",
+        "revs",
+        "root",
+        "_lock",
+        "_labels",
+        "_starts",
+        "_stops",
+        "_digests",
+        "_lengths",
+        "_closed",
+        "_embedded",
+    )
+
     def __init__(self, collection, root=False):
         self.collection = collection
-        self._ci_info = []
         self.revs = []
         self.root = root
+        # Series may be written concurrently (see Collection.squash)
+        self._lock = Lock()
+        # Commit info is stored column-wise
+        self._labels = []
+        self._starts = []
+        self._stops = []
+        self._digests = []
+        self._lengths = []
+        self._closed = []
+        self._embedded = []
+
+    def _columns(self):
+        return (
+            self._labels,
+            self._starts,
+            self._stops,
+            self._digests,
+            self._lengths,
+            self._closed,
+            self._embedded,
+        )
 
     def append(self, label, start, stop, all_dig, frame_len, closed, embedded):
-        self._ci_info.append((label, start, stop, all_dig, frame_len, closed, embedded))
+        row = (label, start, stop, all_dig, frame_len, closed, embedded)
+        with self._lock:
+            for col, value in zip(self._columns(), row):
+                col.append(value)
 
     def extend(self, *other_batches):
-        for b in other_batches:
-            self._ci_info.extend(b._ci_info)
+        with self._lock:
+            for b in other_batches:
+                for col, other_col in zip(self._columns(), b._columns()):
+                    col.extend(other_col)
 
     def flush(self):
-        if len(self._ci_info) == 0:
+        if len(self._labels) == 0:
             return
 
         changelog = self.collection.changelog
         leaf_rev = None if self.root else changelog.leaf()
-        all_ci_info = iter(self._ci_info)
+        # Rows are stored in the same order as the arguments of
+        # Commit.one and Commit.update
+        all_ci_info = zip(*self._columns())
 
         # Combine with last commit
         if leaf_rev:
             last_ci = leaf_rev.commit(self.collection)
         else:
-            label, start, stop, all_dig, length, closed, embedded = next(all_ci_info)
-            last_ci = Commit.one(
-                self.collection.schema,
-                label,
-                start,
-                stop,
-                all_dig,
-                length,
-                closed=closed,
-                embedded=embedded,
-            )
-        for label, start, stop, all_dig, length, closed, embedded in all_ci_info:
-            last_ci = last_ci.update(
-                label, start, stop, all_dig, length, closed=closed, embedded=embedded
-            )
+            last_ci = Commit.one(self.collection.schema, *next(all_ci_info))
+        last_ci = last_ci.update_many(all_ci_info)
 
         # Save it
         payload = last_ci.encode()
@@ -5,7 +5,7 @@ from random import random
 from time import sleep
 
 from .commit import Commit
-from .utils import Pool, hexdigest, hexhash_len, hextime
+from .utils import Pool, chunky, hexdigest, hexhash_len, hextime
 
 zero_hextime = "0" * 11
 zero_hash = "0" * hexhash_len
@@ -39,8 +39,9 @@ class Changelog:
         if _jitter:
             sleep(random())
 
-        # Compute new key
+        # Compute new key, all the revisions share the same child
         key = hexdigest(payload)
+        child = hextime() + "-" + key
 
         # Create one commit per parent
         revs = []
@@ -52,14 +53,36 @@ class Changelog:
                     continue
 
             # Construct new filename and save content
-            child = hextime() + "-" + key
             revision = Revision(self, parent, child)
             self.pod.write(revision.path, payload)
             revs.append(revision)
 
-        self.refresh()
+        self._extend_log(revs)
         return revs
 
+    def _extend_log(self, revs):
+        """
+        Append `revs` to the log cache if they simply extend the
+        current leaf, otherwise drop the cache.
+
+        Revisions written concurrently by other processes are not
+        listed, this is acceptable because the cache is already a
+        snapshot: the same happens for any read done after the first
+        `log()`. At worst our next commit will not use them as parent
+        and creates a branch, which is then reconciled by a merge
+        (like any concurrent write). `refresh()` forces a re-listing.
+        """
+        log = self._log_cache
+        if not log or len(revs) != 1 or log[-1].child != revs[0].parent:
+            self.refresh()
+            return
+        # The new revision is the only child of the last one (the
+        # leaf), so the depth-first traversal would yield it last. We
+        # don't append in place as callers may hold the previous list.
+        log[-1].is_leaf = False
+        revs[0].is_leaf = True
+        self._log_cache = log + revs
+
     def refresh(self):
         self._log_cache = None
 
@@ -118,18 +141,34 @@ class Changelog:
             # Yield
             yield rev
 
+    def read_all(self, revisions=None):
+        """
+        Return the payloads of `revisions` (all revisions if not
+        set). Payloads not already in memory are fetched in one
+        `read_many` call.
+        """
+        if revisions is None:
+            revisions = self.log()
+        missing = [rev for rev in revisions if rev._payload is None]
+        payloads = self.pod.read_many([rev.path for rev in missing])
+        for rev, payload in zip(missing, payloads):
+            # Incorrect checksum will be handled by Revision.read
+            if hexdigest(payload) == rev.digests.child:
+                rev._payload = payload
+        return [rev.read() for rev in revisions]
+
     def pull(self, remote, shallow=False):
-        new_paths = []
         local_digests = set(r.digests for r in self.log())
         remote_revs = remote.leafs() if shallow else remote.log()
-        with Pool() as pool:
-            for remote_rev in remote_revs:
-                if remote_rev.digests in local_digests:
-                    continue
-                path = remote_rev.path
-                new_paths.append(path)
-                payload = remote.pod.read(path)
-                pool.submit(self.pod.write, path, payload)
+        new_paths = [
+            rev.path for rev in remote_revs if rev.digests not in local_digests
+        ]
+        # Fetch remote payloads by chunks, to bound memory usage
+        for chunk in chunky(new_paths):
+            payloads = remote.pod.read_many(chunk)
+            with Pool() as pool:
+                for path, payload in zip(chunk, payloads):
+                    pool.submit(self.pod.write, path, payload)
         self.refresh()
         return new_paths
 
@@ -144,6 +183,7 @@ class Revision:
         self.child = child
         self.is_leaf = False
         self._payload = None
+        self._commit = None
 
     @classmethod
     def from_path(cls, changelog, path):
@@ -185,5 +225,7 @@ class Revision:
         """
         Instanciate commit based on self payload and series schema
         """
-        payload = self.read()
-        return Commit.decode(collection.schema, payload)
+        ci = self._commit
+        if ci is None or ci.schema is not collection.schema:
+            ci = self._commit = Commit.decode(collection.schema, self.read())
+        return ci
@@ -52,9 +52,8 @@ from threading import Lock
 
 from .batch import Batch
 from .changelog import Changelog
-from .commit import Commit
 from .series import KVSeries, Series
-from .utils import Pool, hashed_path, logger, settings
+from .utils import Pool, chunky, hashed_path, logger, settings
 
 __all__ = ["Collection"]
 
@@ -86,8 +85,7 @@ class Collection:
         rev = self.changelog.leaf()
         if rev is None:
             return []
-        payload = rev.read()
-        ci = Commit.decode(self.schema, payload)
+        ci = rev.commit(self)
         return sorted(set(ci.label))
 
     def delete(self, *labels):
@@ -129,14 +127,16 @@ class Collection:
             remote_digs = set(remote.digests(remote.changelog.leafs()))
         else:
             remote_digs = set(remote.digests())
-        sync = lambda path: self.pod.write(path, remote.pod.read(path))
-        with Pool() as pool:
-            for dig in remote_digs:
-                if dig in local_digs:
-                    continue
-                folder, filename = hashed_path(dig)
-                path = folder / filename
-                pool.submit(sync, path)
+        pathes = []
+        for dig in remote_digs - local_digs:
+            folder, filename = hashed_path(dig)
+            pathes.append(str(folder / filename))
+        # Fetch segments by chunks, to bound memory usage
+        for chunk in chunky(pathes):
+            payloads = remote.pod.read_many(chunk)
+            with Pool() as pool:
+                for path, payload in zip(chunk, payloads):
+                    pool.submit(self.pod.write, path, payload)
 
         self.changelog.pull(remote.changelog, shallow=shallow)
 
@@ -170,24 +170,41 @@ class Collection:
         # Reify commits, changelog.log is a depth first traversal, so
         # the first head is also the oldest branch.
         first_ci, *other_ci = [h.commit(self) for h in heads]
-        root_ci = root.commit(self) if root else []
+        # Collect existing rows once, instead of bisecting first_ci
+        # and root_ci for each row
+        seen = first_ci.row_keys()
+        if root:
+            seen.update(root.commit(self).row_keys())
         # Pile all rows for all other commit into the first one
         self.batch = True  # TODO use a real batch instance but adapt
         # multi() to accept the list of heads as
         # parent (and batch will use first parent as
         # last_ci in flush)
+        rows = []
         for ci in other_ci:
             for pos in range(len(ci)):
                 row = ci.at(pos)
                 # Skip existing rows
-                if row in first_ci or row in root_ci:
+                key = (row["label"], row["start"], row["stop"], row["digest"])
+                if key in seen:
                     continue
+                seen.add(key)
 
                 # Re-apply row
                 closed = row["closed"]
                 if closed == "b":
                     # Closed commit can be applied as-is
-                    first_ci = first_ci.update(**row)
+                    rows.append(
+                        (
+                            row["label"],
+                            row["start"],
+                            row["stop"],
+                            row["digest"],
+                            row["length"],
+                            closed,
+                            row["embedded"],
+                        )
+                    )
                 else:
                     # Non-closed: we read and rewrite
                     series = self / row["label"]
@@ -197,7 +214,8 @@ class Collection:
                     ci_info = series.write(
                         frm
                     )  # since batch is true series simply returns info
-                    first_ci = first_ci.update(*ci_info)
+                    rows.append(ci_info)
+        first_ci = first_ci.update_many(rows)
 
         # encode and commit
         payload = first_ci.encode()
@@ -299,6 +317,8 @@ class Collection:
     def digests(self, revisions=None):
         if revisions is None:
             revisions = self.changelog.log()
+        # Prefetch payloads
+        self.changelog.read_all(revisions)
         for rev in revisions:
             ci = rev.commit(self)
             digs = set(chain.from_iterable(ci.digest.values()))
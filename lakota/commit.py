@@ -126,15 +126,17 @@ timestamp,value
 ```
 """
 
+from collections import OrderedDict
 from itertools import chain
 from threading import Lock
+from weakref import WeakValueDictionary
 
-from numcodecs import registry
-from numpy import asarray, concatenate, isin, repeat, where
+import msgpack
+from numpy import asarray, concatenate, isin, repeat
 
 from .frame import Frame
-from .schema import Codec, Schema
-from .utils import Closed, Pool, hashed_path
+from .schema import Codec
+from .utils import Closed, Pool, hashed_path, settings
 
 __all__ = ["Commit", "Segment"]
 
@@ -145,6 +147,10 @@ class Commit:
     len_codec = Codec("int")
     label_codec = Codec("str")
     closed_codec = Codec("str")  # Could be i1
+    # Decoded label and digest arrays, shared between commits with the
+    # same encoded content
+    _interned = WeakValueDictionary()
+    _interned_lock = Lock()  # Decode is called from Pool threads
 
     def __init__(self, schema, label, start, stop, digest, length, closed, embedded):
         assert list(digest) == list(schema)
@@ -171,54 +177,64 @@ class Commit:
     ):
         closed = Closed.cast(closed)
         label = asarray([label])
-        start = dict(zip(schema.idx, (asarray([s]) for s in start)))
-        stop = dict(zip(schema.idx, (asarray([s]) for s in stop)))
+        start_arr, stop_arr = {}, {}
+        # Use column dtypes instead of letting numpy infer them
+        for (name, col), first, last in zip(schema.idx.items(), start, stop):
+            start_arr[name] = asarray([first], dtype=col.codec.dt)
+            stop_arr[name] = asarray([last], dtype=col.codec.dt)
         digest = dict(zip(schema, (asarray([d], dtype="U") for d in digest)))
         length = [length]
         closed = [closed.short]
-        return Commit(schema, label, start, stop, digest, length, closed, embedded)
+        return Commit(
+            schema, label, start_arr, stop_arr, digest, length, closed, embedded
+        )
 
     @classmethod
     def decode(cls, schema, payload):
-        msgpck = registry.codec_registry["msgpack2"]()
-        data = msgpck.decode(payload)[0]
-        values = {}
+        # Payload framing is the one of numcodecs' msgpack2 codec
+        # (applied on a one-item object array): [data, "|O", [1]]
+        data = msgpack.unpackb(payload, raw=False)[0]
+        idx_codecs = [(name, schema[name].codec) for name in schema.idx]
+        digest_codec = cls.digest_codec
         # Decode starts, stops and digests
-        for key in ("start", "stop", "digest"):
-            key_vals = {}
-            columns = schema if key == "digest" else schema.idx
-            for name in columns:
-                codec = cls.digest_codec if key == "digest" else schema[name].codec
-                key_vals[name] = codec.decode(data[key][name])
-            values[key] = key_vals
+        values = {
+            "start": {n: c.decode(data["start"][n]) for n, c in idx_codecs},
+            "stop": {n: c.decode(data["stop"][n]) for n, c in idx_codecs},
+            "digest": {n: cls._intern(digest_codec, data["digest"][n]) for n in schema},
+        }
 
         # Decode len and labels
         values["length"] = cls.len_codec.decode(data["length"])
-        values["label"] = cls.label_codec.decode(data["label"])
+        values["label"] = cls._intern(cls.label_codec, data["label"])
         values["closed"] = cls.closed_codec.decode(data["closed"])
 
         # Embedded data will be decoded on demand
         values["embedded"] = data.get("embedded")
         return Commit(schema, **values)
 
+    @classmethod
+    def _intern(cls, codec, data):
+        key = (codec, data)
+        with cls._interned_lock:
+            arr = cls._interned.get(key)
+        if arr is not None:
+            return arr
+        arr = codec.decode(data)
+        arr.flags.writeable = False
+        with cls._interned_lock:
+            # Keep the first array if another thread was faster
+            return cls._interned.setdefault(key, arr)
+
     def encode(self):
-        msgpck = registry.codec_registry["msgpack2"]()
-        data = {}
+        schema = self.schema
+        idx_codecs = [(name, schema[name].codec) for name in schema.idx]
+        digest_codec = self.digest_codec
         # Encode starts, stops and digests
-        for key in ("start", "stop", "digest"):
-            columns = self.schema if key == "digest" else self.schema.idx
-            key_vals = {}
-            for pos, name in enumerate(columns):
-                codec = (
-                    self.digest_codec if key == "digest" else self.schema[name].codec
-                )
-                arr = getattr(self, key)[name]
-                key_vals[name] = codec.encode(arr)
-            data[key] = key_vals
-
-        # Encode digests
-        for name in self.schema:
-            data["digest"][name] = self.digest_codec.encode(self.digest[name])
+        data = {
+            "start": {n: c.encode(self.start[n]) for n, c in idx_codecs},
+            "stop": {n: c.encode(self.stop[n]) for n, c in idx_codecs},
+            "digest": {n: digest_codec.encode(self.digest[n]) for n in schema},
+        }
 
         # Encode length, closed and labels
         data["length"] = self.len_codec.encode(self.length)
@@ -230,22 +246,32 @@ class Commit:
         )
         embedded = {d: self.embedded[d] for d in sorted(keep_digests)}
         data["embedded"] = embedded
-        return msgpck.encode([data])
+        return msgpack.packb([data, "|O", [1]], use_bin_type=True)
 
     def split(self, label, start, stop):
-        start_values = {"_label": self.label}
-        start_values.update(self.start)
-        stop_values = {"_label": self.label}
-        stop_values.update(self.stop)
-        frm_start = Frame(Schema.from_frame(start_values), start_values)
-        frm_stop = Frame(Schema.from_frame(stop_values), stop_values)
-        start_pos = frm_stop.index((label,) + start, right=True)
-        stop_pos = frm_start.index((label,) + stop, right=False)
+        start_pos = self._bisect(self.stop, (label,) + start, right=True)
+        stop_pos = self._bisect(self.start, (label,) + stop, right=False)
         return start_pos, stop_pos
 
+    def _bisect(self, columns, values, right=False):
+        # Same as Frame.index, on label + `columns` (start or stop):
+        # narrow the [lo, hi) range one column at a time
+        lo, hi = 0, len(self)
+        arrays = chain([self.label], (columns[n] for n in self.schema.idx))
+        for arr, val in zip(arrays, values):
+            lo += arr[lo:hi].searchsorted(val, "left")
+            hi = lo + arr[lo:hi].searchsorted(val, "right")
+        return hi if right else lo
+
     def __len__(self):
         return len(self.label)
 
+    def _start_tuple(self, pos):
+        return tuple(self.start[n][pos] for n in self.schema.idx)
+
+    def _stop_tuple(self, pos):
+        return tuple(self.stop[n][pos] for n in self.schema.idx)
+
     def at(self, pos):
         if pos < 0:
             pos = len(self) + pos
@@ -270,28 +296,34 @@ class Commit:
         if len(self) == 0:
             return inner
 
-        if embedded:
-            self.embedded.update(embedded)
+        # self.embedded is not updated in place, self may be shared
+        # (see Revision.commit). The head and tail pieces carry it and
+        # concat merges it with the new payloads.
 
-        first = (self.at(0)["label"], self.at(0)["start"])
-        last = (self.at(-1)["label"], self.at(-1)["stop"])
+        first = (self.label[0], self._start_tuple(0))
+        last = (self.label[-1], self._stop_tuple(-1))
         if (label, start) < first and (label, stop) > last:
             return inner
 
         start_pos, stop_pos = self.split(label, start, stop)
         # Truncate start_pos row
-        head = None
         # start_pos is the result of a bisect_right, so we have to
         # check the slot on the left that may be perfect match
         start_row = None
-        if start_pos > 0:
-            prev_row = self.at(start_pos - 1)
-            if prev_row["stop"] == start:
-                start_pos -= 1
-                start_row = prev_row
+        if (
+            start_pos > 0
+            and self.label[start_pos - 1] == label
+            and self._stop_tuple(start_pos - 1) == start
+        ):
+            start_pos -= 1
+            start_row = self.at(start_pos)
         if start_row is None:
             start_row = self.at(min(start_pos, len(self) - 1))
 
+        # Pieces of the new commit, concatenated once at the end
+        # (empty head and tail are not materialized)
+        parts = [self.head(start_pos)] if start_pos > 0 else []
+
         if (
             label == start_row["label"]
             and start_row["start"] <= start <= start_row["stop"]
@@ -303,33 +335,28 @@ class Commit:
             start_row["closed"] = Closed[start_row["closed"]].set_right(not closed.left)
 
             if (
-                start_row["start"] == start_row["stop"]
-                and start_row["closed"] != Closed.BOTH
+                start_row["start"] != start_row["stop"]
+                or start_row["closed"] == Closed.BOTH
             ):
-                # Ignore star_row
-                head = self.head(start_pos)
-            else:
-                head = Commit.concat(
-                    self.head(start_pos),
-                    Commit.one(schema=self.schema, **start_row),
-                )
+                # Keep truncated start_row
+                parts.append(Commit.one(schema=self.schema, **start_row))
             # when start_row["start"] == start_row["stop"],
             # start_row stop and start are both "overshadowed" by
             # new commit
 
-        if head is None:
-            head = self.head(start_pos)
+        parts.append(inner)
 
         # Truncate stop_pos row
-        tail = None
         # stop_pos is the result of a bisect_left, so we have to
         # check the slot on the right that may be perfect match
         stop_row = None
-        if stop_pos < len(self):
-            next_row = self.at(stop_pos)
-            if next_row["start"] == stop:
-                stop_row = next_row
-                stop_pos += 1
+        if (
+            stop_pos < len(self)
+            and self.label[stop_pos] == label
+            and self._start_tuple(stop_pos) == stop
+        ):
+            stop_row = self.at(stop_pos)
+            stop_pos += 1
         if stop_row is None:
             stop_row = self.at(max(0, stop_pos - 1))
 
@@ -341,22 +368,41 @@ class Commit:
             stop_row["closed"] = Closed[stop_row["closed"]].set_left(not closed.right)
 
             if (
-                stop_row["start"] == stop_row["stop"]
-                and start_row["closed"] != Closed.BOTH
+                stop_row["start"] != stop_row["stop"]
+                or start_row["closed"] == Closed.BOTH
             ):
-                # Ignore stop_row
-                tail = self.tail(stop_pos)
-            else:
-                tail = Commit.concat(
-                    Commit.one(schema=self.schema, **stop_row),
-                    self.tail(stop_pos),
-                )
+                # Keep truncated stop_row
+                parts.append(Commit.one(schema=self.schema, **stop_row))
             # when stop_row["start"] == stop_row["stop"],
             # stop_row stop and start are both "overshadowed" by
             # new commit
-        if tail is None:
-            tail = self.tail(stop_pos)
-        return Commit.concat(head, inner, tail)
+        if stop_pos < len(self):
+            parts.append(self.tail(stop_pos))
+        return Commit.concat(*parts)
+
+    def update_many(self, rows):
+        """
+        Apply `rows` (tuples following the `update` signature) one
+        after the other. Consecutive rows landing strictly after the
+        tail of the commit are staged and concatenated at once.
+        """
+        ci = self
+        staged = []
+        tail = (ci.label[-1], ci._stop_tuple(-1)) if len(ci) > 0 else None
+        for row in rows:
+            label, start, stop = row[:3]
+            if tail is not None and (label, start) > tail and start <= stop:
+                staged.append(Commit.one(self.schema, *row))
+                tail = (label, stop)
+                continue
+            if staged:
+                ci = Commit.concat(ci, *staged)
+                staged = []
+            ci = ci.update(*row)
+            tail = (ci.label[-1], ci._stop_tuple(-1))
+        if staged:
+            ci = Commit.concat(ci, *staged)
+        return ci
 
     def slice(self, *pos):
         slc = slice(*pos)
@@ -381,14 +427,15 @@ class Commit:
         all_ci = (commit,) + other_commits
         all_ci = tuple(ci for ci in all_ci if len(ci) > 0)
 
+        if len(all_ci) == 1:
+            # Nothing to copy
+            return all_ci[0]
+
         # Make sure there are no overlaps
         for prv, nxt in zip(all_ci[:-1], all_ci[1:]):
-            prv_tail = prv.at(-1)
-            nxt_head = nxt.at(0)
-            assert (prv_tail["label"], prv_tail["stop"]) <= (
-                nxt_head["label"],
-                nxt_head["start"],
-            )
+            prv_tail = (prv.label[-1], prv._stop_tuple(-1))
+            nxt_head = (nxt.label[0], nxt._start_tuple(0))
+            assert prv_tail <= nxt_head
 
         start = {
             name: concatenate([ci.start[name] for ci in all_ci]) for name in schema.idx
@@ -417,11 +464,27 @@ class Commit:
         )
         return f"<Commit {items}>"
 
-    def match(self, label):
-        (matches,) = where(self.label == label)
-        for pos in matches:
+    def match(self, label, start=None, stop=None):
+        lo, hi = self._match_range(label, start, stop)
+        for pos in range(lo, hi):
             yield self.at(pos)
 
+    def _match_range(self, label, start=None, stop=None):
+        # Rows are sorted on (label, start) and do not overlap, so
+        # within a label both start and stop columns are sorted and
+        # we can bisect them.
+        lo = self.label.searchsorted(label, "left")
+        hi = self.label.searchsorted(label, "right")
+        # Coarse pruning based on the first index column: rows ending
+        # before start[0] or beginning after stop[0] can not intersect
+        # the [start, stop] range
+        first = next(iter(self.schema.idx))
+        if start:
+            lo += self.stop[first][lo:hi].searchsorted(start[0], "left")
+        if stop:
+            hi = lo + self.start[first][lo:hi].searchsorted(stop[0], "right")
+        return lo, hi
+
     def segments(self, label, pod, start=None, stop=None, closed=Closed.BOTH):
         closed = Closed.cast(closed)
 
@@ -434,12 +497,18 @@ class Commit:
             closed = closed.set_right(True)
         res = []
 
-        for row in self.match(
-            label
-        ):  # XXX allow to pass condition instead of simple start-stop ?
-            arr_start = row["start"]
-            arr_stop = row["stop"]
-            arr_closed = Closed[row["closed"]]
+        # Matching rows are contiguous, gather their values column
+        # by column
+        lo, hi = self._match_range(label, start, stop)
+        idx = self.schema.idx
+        rows = zip(
+            zip(*(self.start[n][lo:hi] for n in idx)),
+            zip(*(self.stop[n][lo:hi] for n in idx)),
+            zip(*(self.digest[n][lo:hi] for n in self.schema)),
+            self.closed[lo:hi],
+        )
+        for arr_start, arr_stop, digest, arr_closed in rows:
+            arr_closed = Closed[arr_closed]
             if start:
                 if start > arr_stop:
                     # start is on the right of the array
@@ -470,7 +539,7 @@ class Commit:
             sgm = Segment(
                 self,
                 pod,
-                row["digest"],
+                digest,
                 start=arr_start,
                 stop=arr_stop,
                 closed=arr_closed,
@@ -503,11 +572,26 @@ class Commit:
         extract.label = repeat(to_label, len(extract))
 
         # Re-inject it
-        for pos in range(len(extract)):
-            row = extract.at(pos)
-            base_ci = base_ci.update(**row)
+        idx = self.schema.idx
+        rows = zip(
+            extract.label,
+            zip(*(extract.start[n] for n in idx)),
+            zip(*(extract.stop[n] for n in idx)),
+            zip(*(extract.digest[n] for n in self.schema)),
+            extract.length,
+            extract.closed,
+            [extract.embedded] * len(extract),
+        )
+        return base_ci.update_many(rows)
 
-        return base_ci
+    def row_keys(self):
+        """
+        Return a set of (label, start, stop, digest) tuples, one per row
+        """
+        starts = zip(*(self.start[n] for n in self.schema.idx))
+        stops = zip(*(self.stop[n] for n in self.schema.idx))
+        digests = zip(*(self.digest[n] for n in self.schema))
+        return set(zip(self.label, starts, stops, digests))
 
     def __contains__(self, row):
         start_pos, _ = self.split(row["label"], row["start"], row["stop"])
@@ -544,20 +628,13 @@ class Segment:
 
     def _read(self, name):
         dig = self.digest[name]
+        codec = self.commit.schema[name].codec
         # check first if content is not already in commit
         data = self.commit.embedded.get(dig)
         if data is None:
-            folder, filename = hashed_path(dig)
-            sub_pod = self.pod.cd(folder)
-            try:
-                data = sub_pod.read(filename)
-            except FileNotFoundError:
-                for f in sub_pod.ls():
-                    # File is in soft-delete mode
-                    if f.startswith(filename):
-                        data = sub_pod.read(f)
-                        break
-        arr = self.commit.schema[name].codec.decode(data)
+            arr = read_column(self.pod, dig, codec)
+        else:
+            arr = codec.decode(data)
         return arr[self.start_pos : self.stop_pos]
 
     @property
@@ -567,12 +644,14 @@ class Segment:
             if self._frm is not None:
                 return self._frm
 
-            cols = {}
-            # with Pool() as pool: # TODO need a smarter pool
-            #     for name in self.commit.schema.idx:
-            #         pool.submit(lambda: cols.update({name: self._read(name)}))
-            for name in self.commit.schema.idx:
-                cols[name] = self._read(name)
+            # Read index columns concurrently (Pool runs serially when
+            # already nested in another pool, like in
+            # Frame.from_segments)
+            idx = list(self.commit.schema.idx)
+            with Pool() as pool:
+                for name in idx:
+                    pool.submit(self._read, name)
+            cols = dict(zip(idx, pool.results))
 
             frm = Frame(self.commit.schema, cols)
             self.start_pos, self.stop_pos = frm.index_slice(
@@ -580,3 +659,74 @@ class Segment:
             )
             self._frm = frm.slice(self.start_pos, self.stop_pos)
             return self._frm
+
+
+class ColumnCache:
+    """
+    LRU cache of decoded arrays, bounded by the total size of the
+    arrays (see `settings.column_cache_size`)
+    """
+
+    def __init__(self):
+        self.arrays = OrderedDict()
+        self.nbytes = 0
+        self.lock = Lock()
+
+    def get(self, key):
+        with self.lock:
+            arr = self.arrays.get(key)
+            if arr is not None:
+                self.arrays.move_to_end(key)
+            return arr
+
+    def set(self, key, arr):
+        max_bytes = settings.column_cache_size
+        if arr.nbytes > max_bytes:
+            return
+        with self.lock:
+            if key in self.arrays:
+                return
+            self.arrays[key] = arr
+            self.nbytes += arr.nbytes
+            while self.nbytes > max_bytes:
+                _, old = self.arrays.popitem(last=False)
+                self.nbytes -= old.nbytes
+
+    def clear(self):
+        with self.lock:
+            self.arrays.clear()
+            self.nbytes = 0
+
+
+column_cache = ColumnCache()
+
+
+def read_column(pod, digest, codec):
+    """
+    Read and decode the array identified by `digest`. Files are
+    content-addressed, so the result can be cached without
+    invalidation.
+    """
+    # The codec is part of the key: columns of different types can
+    # share the same content (and so the same digest)
+    key = (pod.token, digest, codec)
+    arr = column_cache.get(key)
+    if arr is not None:
+        return arr
+
+    folder, filename = hashed_path(digest)
+    sub_pod = pod.cd(folder)
+    try:
+        data = sub_pod.read(filename)
+    except FileNotFoundError:
+        data = None
+        for f in sub_pod.ls():
+            # File is in soft-delete mode
+            if f.startswith(filename):
+                data = sub_pod.read(f)
+                break
+    arr = codec.decode(data)
+    # The array is shared between readers
+    arr.flags.writeable = False
+    column_cache.set(key, arr)
+    return arr
@@ -87,13 +87,12 @@ class Frame:
         idx_cols = list(self.schema.idx)
         if len(idx_cols) == 1:
             arr = self[idx_cols[0]]
-            return all(arr[1:] >= arr[:-1])
+            return bool((arr[1:] >= arr[:-1]).all())
 
         # Multi-column index we fallback on argsort
-        arr = rec.fromarrays([self[n] for n in idx_cols], names=idx_cols)
         sort_mask = self.argsort()
         a_range = arange(len(sort_mask))
-        return all(sort_mask == a_range)
+        return bool((sort_mask == a_range).all())
 
     @classmethod
     def concat(cls, *frames):
@@ -139,11 +138,11 @@ class Frame:
         return Frame(self.schema, cols)
 
     def eval(self, expr, env=None):
-        ast = AST.parse(expr)
+        fn = AST.parse_compiled(expr)
         eval_env = self.eval_env()
         if env is not None:
             eval_env.update(env)
-        res = ast.eval(eval_env)
+        res = fn(eval_env)
         return res
 
     def eval_env(self):
@@ -1,4 +1,5 @@
 import base64
+import struct
 from pathlib import PurePosixPath
 
 import requests
@@ -47,7 +48,32 @@ class HttpPOD(POD):
             raise FileNotFoundError(f"{relpath} not found")
         else:
             resp.raise_for_status()
-        return base64.b64decode(resp.json()["body"])
+        if resp.headers.get("content-type") == "application/json":
+            # Base64-wrapped payload
+            return base64.b64decode(resp.json()["body"])
+        return resp.content
+
+    def read_many(self, pathes):
+        # Fetch all payloads in one request
+        logger.debug("READ %s://%s (%s files)", self.protocol, self.path, len(pathes))
+        pathes = [str(self.path / p) for p in pathes]
+        if not pathes:
+            return []
+        resp = self.session.post(self.base_uri + "read_many", json={"pathes": pathes})
+
+        resp.raise_for_status()
+        # Payloads are prefixed by their length, see server.py
+        buff = memoryview(resp.content)
+        payloads = []
+        pos = 0
+        for path in pathes:
+            (size,) = struct.unpack_from(">q", buff, pos)
+            pos += 8
+            if size < 0:
+                raise FileNotFoundError(f"{path} not found")
+            payloads.append(bytes(buff[pos : pos + size]))
+            pos += size
+        return payloads
 
     def write(self, relpath, data, mode="wb"):
         logger.debug("WRITE %s://%s %s", self.protocol, self.path, relpath)
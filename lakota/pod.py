@@ -18,6 +18,8 @@ It is mainly used through the `lakota.Repo` class.
 import io
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
 from pathlib import Path, PurePosixPath
 from threading import Lock
 from time import time
@@ -34,7 +36,7 @@ try:
 except ImportError:
     requests = None
 
-from .utils import logger
+from .utils import Pool, logger, settings
 
 __all__ = ["POD", "FilePOD", "MemPOD", "CachePOD"]
 
@@ -127,9 +129,23 @@ class POD:
     def __truediv__(self, relpath):
         return self.cd(relpath)
 
-    def rm_many(self, pathes, recursive=False):
+    def rm_many(self, pathes, recursive=False, missing_ok=False):
         for path in pathes:
-            self.rm(path, recursive=recursive)
+            self.rm(path, recursive=recursive, missing_ok=missing_ok)
+
+    def read_stream(self, relpath, chunk_size=4 * 1024 * 1024):
+        """
+        Yield content of `relpath` by chunks of `chunk_size` bytes
+        """
+        payload = memoryview(self.read(relpath))
+        for pos in range(0, len(payload), chunk_size):
+            yield bytes(payload[pos : pos + chunk_size])
+
+    def read_many(self, pathes):
+        with Pool() as pool:
+            for path in pathes:
+                pool.submit(self.read, path)
+        return pool.results
 
     def walk(self, max_depth=None):
         if max_depth == 0:
@@ -139,7 +155,7 @@ class POD:
         while folders:
             folder = folders.pop()
             root, name, depth = folder
-            full_path = str(PurePosixPath(root) / name)
+            full_path = f"{root}/{name}" if root else name
             if self.isdir(full_path):
                 if max_depth is not None and depth >= max_depth:
                     continue
@@ -168,7 +184,7 @@ class FilePOD(POD):
         logger.debug("LIST %s %s", self.path, relpath)
         path = self.path / relpath
         try:
-            return list(p.name for p in path.iterdir())
+            return os.listdir(path)
         except FileNotFoundError:
             if missing_ok:
                 return []
@@ -178,16 +194,37 @@ class FilePOD(POD):
         logger.debug("READ %s %s", self.path, relpath)
         path = self.path / relpath
         # XXX make sure path is subpath of self.path
-        return path.open(mode).read()
+        if mode == "rb":
+            return path.read_bytes()
+        with path.open(mode) as fh:
+            return fh.read()
+
+    def read_stream(self, relpath, chunk_size=4 * 1024 * 1024):
+        logger.debug("READ-STREAM %s %s", self.path, relpath)
+        path = self.path / relpath
+        with path.open("rb") as fh:
+            while True:
+                chunk = fh.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
 
     def write(self, relpath, data, mode="wb"):
-        if self.isfile(relpath):
+        path = self.path / relpath
+        # Exclusive creation, fails if the file already exists
+        xmode = mode.replace("w", "x")
+        try:
+            try:
+                fh = path.open(xmode)
+            except FileNotFoundError:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                fh = path.open(xmode)
+        except FileExistsError:
             logger.debug("SKIP-WRITE %s %s", self.path, relpath)
             return
         logger.debug("WRITE %s %s", self.path, relpath)
-        path = self.path / relpath
-        path.parent.mkdir(parents=True, exist_ok=True)
-        return path.open(mode).write(data)
+        with fh:
+            return fh.write(data)
 
     def isdir(self, relpath):
         return self.path.joinpath(relpath).is_dir()
@@ -323,14 +360,21 @@ class MemPOD(POD):
     protocol = "memory"
 
     def __init__(self, path, store=None, lru_size=None):
-        self.path = Path(path)
-        self.parts = self.path.parts
+        # Store is keyed on path parts, `path` can be given directly
+        # as a tuple of parts
+        self.parts = path if isinstance(path, tuple) else Path(path).parts
         self.store = store or Store(lru_size=lru_size)
         super().__init__()
 
+    @property
+    def path(self):
+        return Path(*self.parts)
+
     def cd(self, *others):
-        path = Path(*(self.parts + others))
-        return MemPOD(path, store=self.store)
+        parts = self.parts
+        for other in others:
+            parts += self.split(other)
+        return MemPOD(parts, store=self.store)
 
     def isdir(self, relpath):
         relpath = self.split(relpath)
@@ -345,11 +389,6 @@ class MemPOD(POD):
         return isinstance(item, File)
 
     def write(self, relpath, data, mode="rb"):
-        if self.isfile(relpath):
-            logger.debug("SKIP-WRITE memory://%s %s", self.path, relpath)
-            return
-        logger.debug("WRITE memory://%s %s", "/".join(self.parts), relpath)
-
         current_path = tuple()
         relpath = self.split(relpath)
         full_path = self.parts + relpath
@@ -364,11 +403,10 @@ class MemPOD(POD):
                 current_file = self.store.get(current_path)
                 if current_file is not None:
                     assert isinstance(current_file, File)
-                    logger.debug(
-                        "SKIP-WRITE memory://%s %s", self.path, "/".join(relpath)
-                    )
-                else:
-                    self.store.set(current_path, File(data))
+                    logger.debug("SKIP-WRITE memory://%s", "/".join(full_path))
+                    return
+                logger.debug("WRITE memory://%s", "/".join(full_path))
+                self.store.set(current_path, File(data))
             else:
                 folder.add(part, Folder)
         return len(data)
@@ -395,10 +433,18 @@ class MemPOD(POD):
             if not recursive:
                 raise FileNotFoundError(f"{relpath} is not empty")
 
-            # Delete and recurse
-            self.store.delete(path)
-            for child in list(item.items):
-                self.rm(relpath + "/" + child, recursive=True)
+            # Delete folder and its content
+            stack = [(path, item)]
+            while stack:
+                folder_path, folder = stack.pop()
+                self.store.delete(folder_path)
+                for child in folder.items:
+                    child_path = folder_path + (child,)
+                    child_item = self.store.get(child_path)
+                    if isinstance(child_item, Folder):
+                        stack.append((child_path, child_item))
+                    elif child_item is not None:
+                        self.store.delete(child_path)
 
         elif not missing_ok:
             raise FileNotFoundError(f"{relpath} not found")
@@ -431,21 +477,29 @@ class MemPOD(POD):
         self.rm(from_path)
 
     @classmethod
+    @lru_cache(maxsize=4096)
     def split(cls, path):
+        # Cached as the same (hashed) paths are accessed repeatedly
         if not path:
             return tuple()
         if isinstance(path, tuple):
             return path
         if isinstance(path, PurePosixPath):
             return path.parts
-        return tuple(p for p in path.split("/") if p != ".")
+        return tuple(p for p in path.split("/") if p not in (".", ""))
 
 
 class CachePOD(POD):
+    # Executor used to write remote payloads in the local pod
+    _executor = ThreadPoolExecutor(2)
+
     def __init__(self, local, remote):
         self.local = local
         self.remote = remote
         self.protocol = f"{local.protocol}+{remote.protocol}"
+        # Payloads not yet written in local (shared with sub-pods)
+        self._pending = {}
+        self._pending_lock = Lock()
         super().__init__()
 
     @property
@@ -455,21 +509,68 @@ class CachePOD(POD):
     def cd(self, *others):
         local = self.local.cd(*others)
         remote = self.remote.cd(*others)
-        return CachePOD(local, remote)
+        pod = CachePOD(local, remote)
+        pod._pending = self._pending
+        pod._pending_lock = self._pending_lock
+        return pod
 
     def ls(self, relpath=".", missing_ok=False):
         return self.remote.ls(relpath, missing_ok=missing_ok)
 
+    def walk(self, max_depth=None):
+        return self.remote.walk(max_depth=max_depth)
+
     def read(self, relpath, mode="rb"):
+        key = str(self.local.path / relpath)
+        pending = self._pending.get(key)
+        if pending is not None:
+            return pending[0]
         try:
             return self.local.read(relpath, mode=mode)
         except FileNotFoundError:
             pass
 
         data = self.remote.read(relpath, mode=mode)
-        self.local.write(relpath, data)
+        self.write_back(key, relpath, data)
         return data
 
+    def write_back(self, key, relpath, data):
+        """
+        Write `data` in the local pod without blocking the caller
+        """
+        if not settings.threaded:
+            self._write_local(key, relpath, data)
+            return
+
+        def job():
+            try:
+                self._write_local(key, relpath, data)
+            finally:
+                with self._pending_lock:
+                    del self._pending[key]
+
+        with self._pending_lock:
+            if key in self._pending:
+                return
+            fut = self._executor.submit(job)
+            self._pending[key] = (data, fut)
+
+    def _write_local(self, key, relpath, data):
+        # Filling the cache is best-effort, a failure is logged and
+        # the content will be read again from remote
+        try:
+            self.local.write(relpath, data)
+        except Exception:
+            logger.exception("Write-back of %s failed", key)
+
+    def flush(self):
+        """
+        Wait for pending local writes
+        """
+        with self._pending_lock:
+            futures = [fut for _, fut in self._pending.values()]
+        wait(futures)
+
     def write(self, relpath, data, mode="wb"):
         self.local.write(relpath, data, mode=mode)
         return self.remote.write(relpath, data, mode=mode)
@@ -482,13 +583,24 @@ class CachePOD(POD):
 
     def rm(self, relpath, recursive=False, missing_ok=False):
         self.remote.rm(relpath, recursive=recursive, missing_ok=missing_ok)
+        self.flush()
         try:
             self.local.rm(relpath, recursive=recursive, missing_ok=missing_ok)
         except FileNotFoundError:
             pass
 
+    def rm_many(self, pathes, recursive=False, missing_ok=False):
+        # Let remote use its bulk deletion
+        self.remote.rm_many(pathes, recursive=recursive, missing_ok=missing_ok)
+        self.flush()
+        try:
+            self.local.rm_many(pathes, recursive=recursive, missing_ok=True)
+        except FileNotFoundError:
+            pass
+
     def mv(self, from_path, to_path, missing_ok=False):
         self.remote.mv(from_path, to_path, missing_ok=missing_ok)
+        self.flush()
         try:
             self.local.mv(from_path, to_path)
         except FileNotFoundError:
@@ -78,19 +78,33 @@ nb_file_deleted = repo.gc()
 
 import csv
 import json
+from functools import lru_cache
 from io import BytesIO, StringIO
 from itertools import chain
 from time import time
 
+from numpy import isin
+
 from .changelog import zero_hash
 from .collection import Collection
 from .pod import POD
 from .schema import Schema
 from .utils import Pool, hashed_path, hexdigest, hextime, logger, settings
 
+try:
+    from pandas import DataFrame, read_csv
+except ImportError:
+    DataFrame = read_csv = None
+
 __all__ = ["Repo"]
 
 
+@lru_cache(maxsize=256)
+def _loads_schema(json_schema):
+    # Collections often share the same schema
+    return Schema.loads(json.loads(json_schema))
+
+
 class Repo:
     schema = Schema.kv(label="str*", meta="O")
 
@@ -107,33 +121,63 @@ class Repo:
         self.pod = pod
         path = folder / filename
         self.registry = Collection("registry", self.schema, path, self)
+        # Registry frames, valid as long as the registry leaf is
+        # unchanged
+        self._registry_leaf = None
+        self._registry_frames = {}
+        # Schemas of reified collections, keyed by the id of the meta
+        # dict they come from (see reify)
+        self._schemas = {}
 
     def ls(self):
-        return [item.label for item in self.search()]
+        return list(self._label_iter())
+
+    def _label_iter(self, namespace="collection"):
+        # Labels only, without instanciating collections
+        yield from self.registry_frame(namespace)["label"]
 
     def __iter__(self):
         return self.search()
 
     def search(self, label=None, namespace="collection"):
+        frm = self.registry_frame(namespace)
         if label:
-            start = stop = (label,)
-        else:
-            start = stop = None
-        series = self.registry.series(namespace)
-        qr = series[start:stop] @ {"closed": "BOTH"}
-        frm = qr.frame()
-        for l in frm["label"]:
-            yield self.collection(l, frm)
+            frm = frm.slice(*frm.index_slice([label], [label], closed="BOTH"))
+        for l, meta in zip(frm["label"], frm["meta"]):
+            yield self.reify(l, meta)
+
+    def registry_frame(self, namespace="collection"):
+        """
+        Return the registry content for `namespace`. The frame is
+        memoized until the registry changes (new revision or refresh)
+        """
+        frm = self._memoized_registry_frame(namespace)
+        if frm is None:
+            frm = self.registry.series(namespace).frame()
+            self._registry_frames[namespace] = frm
+        return frm
+
+    def _memoized_registry_frame(self, namespace):
+        # Return registry frame if it is memoized for the current leaf
+        leaf = self.registry.changelog.leaf()
+        leaf = leaf and leaf.child
+        if leaf != self._registry_leaf:
+            self._registry_leaf = leaf
+            self._registry_frames = {}
+            self._schemas = {}
+        return self._registry_frames.get(namespace)
 
     def __truediv__(self, name):
         return self.collection(name)
 
-    def collection(self, label, from_frm=None, namespace="collection"):
-        series = self.registry.series(namespace)
-        if from_frm:
-            frm = from_frm.slice(*from_frm.index_slice([label], [label], closed="BOTH"))
-        else:
+    def collection(self, label, *, namespace="collection"):
+        frm = self._memoized_registry_frame(namespace)
+        if frm is None:
+            # Only read the needed range
+            series = self.registry.series(namespace)
             frm = series.frame(start=label, stop=label, closed="BOTH")
+        else:
+            frm = frm.slice(*frm.index_slice([label], [label], closed="BOTH"))
 
         if frm.empty:
             return None
@@ -160,15 +204,20 @@ class Repo:
         schema_dump = schema.dumps()
 
         series = self.registry.series(namespace)
-        current_labels = series.frame(
-            start=min(labels), stop=max(labels), closed="BOTH", select="label"
-        )["label"]
-
-        for label in labels:
-            label = label.strip()
+        frm = self._memoized_registry_frame(namespace)
+        if frm is None:
+            # Only read the needed range
+            frm = series.frame(
+                start=min(labels), stop=max(labels), closed="BOTH", select="label"
+            )
+        # One vectorized membership test for all labels
+        stripped = [label.strip() for label in labels]
+        exists = isin(stripped, frm["label"])
+
+        for label, label_exists in zip(stripped, exists):
             if len(label) == 0:
                 raise ValueError(f"Invalid label: {label}")
-            if label in current_labels and raise_if_exists:
+            if label_exists and raise_if_exists:
                 raise ValueError(f"Collection with label '{label}' already exists")
 
             key = label.encode()
@@ -186,8 +235,21 @@ class Repo:
         return res
 
     def reify(self, name, meta):
-        schema = Schema.loads(meta["schema"])
-        return Collection(name, schema, meta["path"], self)
+        # Meta dicts of a memoized registry frame are re-used across
+        # calls, so their identity is a cheap key. The schema dict is
+        # kept in the cache, so its id can not be re-used.
+        schema_dump = meta["schema"]
+        cached = self._schemas.get(id(schema_dump))
+        if cached is None:
+            if len(self._schemas) >= 65536:
+                # Range reads (see collection) create new dicts on
+                # each call, don't let them pile up
+                self._schemas = {}
+            # Schemas are shared across collections, fallback on the
+            # content-based cache
+            schema = _loads_schema(json.dumps(schema_dump))
+            cached = self._schemas[id(schema_dump)] = (schema_dump, schema)
+        return Collection(name, cached[1], meta["path"], self)
 
     def archive(self, collection):
         label = collection.label
@@ -246,17 +308,17 @@ class Repo:
         # Pull registry
         self.registry.pull(remote.registry, shallow=shallow)
         # Extract frames
-        local_cache = {l.label: l for l in self.search()}
+        local_labels = set(self._label_iter())
         remote_cache = {r.label: r for r in remote.search()}
         if not labels:
             labels = remote_cache.keys()
         for label in labels:
             logger.info("Sync collection: %s", label)
             r_clct = remote_cache[label]
-            if not label in local_cache:
+            if not label in local_labels:
                 l_clct = self.create_collection(r_clct.schema, label)
             else:
-                l_clct = local_cache[label]
+                l_clct = self.collection(label)
                 if l_clct.schema != r_clct.schema:
                     msg = (
                         f'Unable to sync collection "{label}",'
@@ -288,8 +350,10 @@ class Repo:
         labels[mask] = to_label
         frm["label"] = labels
 
-        # Re-order frame
-        frm = frm.sorted()
+        # Re-order frame, only needed if the new label moved to
+        # another position
+        if not frm.is_sorted():
+            frm = frm.sorted()
         series.write(
             frm,
             start=min(
@@ -315,10 +379,16 @@ class Repo:
         # after the segments, we minimize chance to bury data created
         # concurrently.
         self.refresh()
-        active_digests = set(self.registry.digests())
-        for namespace in self.registry.ls():
-            for clct in self.search(namespace=namespace):
-                active_digests.update(clct.digests())
+        collections = [
+            clct
+            for namespace in self.registry.ls()
+            for clct in self.search(namespace=namespace)
+        ]
+        with Pool() as pool:
+            pool.submit(lambda: set(self.registry.digests()))
+            for clct in collections:
+                pool.submit(lambda c: set(c.digests()), clct)
+        active_digests = set().union(*pool.results)
 
         nb_hard_del = 0
         nb_soft_del = 0
@@ -327,12 +397,14 @@ class Repo:
 
         # Soft-Delete ("bury") files on fs not in changelogs
         inactive = all_dig - active_digests
+        moves = []
+        hard_deletes = []
         for dig in inactive:
             if not "." in dig:
                 # Disable digest
                 folder, filename = hashed_path(dig)
                 path = str(folder / filename)
-                self.pod.mv(path, path + current_ts_ext, missing_ok=True)
+                moves.append((path, path + current_ts_ext))
                 nb_soft_del += 1
                 continue
 
@@ -348,12 +420,17 @@ class Repo:
 
             if dig in active_digests:
                 # Re-enable by removing extension
-                self.pod.mv(path + f".{ext}", path, missing_ok=True)
+                moves.append((path + f".{ext}", path))
             else:
                 # Permanent deletion
-                self.pod.rm(path + f".{ext}", missing_ok=True)
+                hard_deletes.append(path + f".{ext}")
                 nb_hard_del += 1
 
+        with Pool() as pool:
+            for from_path, to_path in moves:
+                pool.submit(self.pod.mv, from_path, to_path, missing_ok=True)
+        self.pod.rm_many(hard_deletes, missing_ok=True)
+
         logger.info(
             "End of GC (hard deletions: %s, soft deletions: %s)",
             nb_hard_del,
@@ -378,6 +455,8 @@ class Repo:
         if not isinstance(src, POD):
             src = POD.from_uri(src)
         names = collections or src.ls()
+        # Create missing collections first, as it updates the registry
+        todo = []
         for clc_name in names:
             clc = self / clc_name
             pod = src.cd(clc_name)
@@ -385,23 +464,37 @@ class Repo:
                 json_schema = pod.read("_schema.json").decode()
                 schema = Schema.loads(json.loads(json_schema))
                 clc = self.create_collection(schema, clc_name)
-            logger.info('Import collection "%s"', clc_name)
-            with clc.multi():
-                for file_name in pod.ls():
-                    if file_name.startswith("_"):
-                        continue
-                    self.import_series(pod, clc, file_name)
+            todo.append((pod, clc))
+
+        # Import collections concurrently
+        with Pool() as pool:
+            for pod, clc in todo:
+                pool.submit(self._import_collection, pod, clc)
+
+    def _import_collection(self, pod, clc):
+        logger.info('Import collection "%s"', clc.label)
+        with clc.multi():
+            for file_name in pod.ls():
+                if file_name.startswith("_"):
+                    continue
+                self.import_series(pod, clc, file_name)
 
     def import_series(self, from_pod, collection, filename):
         stem, ext = filename.rsplit(".", 1)
         column_names = sorted(collection.schema)
         if ext == "csv":
-            buff = StringIO(from_pod.read(filename).decode())
-            reader = csv.reader(buff)
-            headers = next(reader)
+            payload = from_pod.read(filename)
+            if read_csv is not None:
+                # Parse in C, values are kept as strings (like
+                # csv.reader) and cast by the schema on write
+                df = read_csv(BytesIO(payload), dtype=str, keep_default_na=False)
+                headers = list(df.columns)
+                frm = {h: df[h].values for h in headers}
+            else:
+                reader = csv.reader(StringIO(payload.decode()))
+                headers = next(reader)
+                frm = dict(zip(headers, zip(*reader)))
             assert sorted(headers) == column_names
-            columns = zip(*reader)
-            frm = dict(zip(headers, columns))
             srs = collection / stem
             srs.write(frm)
 
@@ -421,17 +514,21 @@ class Repo:
             dest = POD.from_uri(dest)
 
         names = collections or self.ls()
-        for clc_name in names:
-            clc = self / clc_name
-            if clc is None:
-                logger.warn('Collection "%s" not found', clc_name)
-            pod = dest.cd(clc_name)
-            logger.info('Export collection "%s"', clc_name)
-            schema = clc.schema.dumps()
-            pod.write("_schema.json", json.dumps(schema).encode())
-            for srs in clc:
-                # Read series
-                self.export_series(pod, srs, file_type)
+        with Pool() as pool:
+            for clc_name in names:
+                clc = self / clc_name
+                if clc is None:
+                    logger.warn('Collection "%s" not found', clc_name)
+                    continue
+                pool.submit(self._export_collection, dest.cd(clc_name), clc, file_type)
+
+    def _export_collection(self, pod, clc, file_type):
+        logger.info('Export collection "%s"', clc.label)
+        schema = clc.schema.dumps()
+        pod.write("_schema.json", json.dumps(schema).encode())
+        for srs in clc:
+            # Read series
+            self.export_series(pod, srs, file_type)
 
     def export_series(self, pod, series, file_type):
         if file_type == "csv":
@@ -439,17 +536,20 @@ class Repo:
             columns = list(frm)
             # Save series as csv in buff
             buff = StringIO()
-            writer = csv.writer(buff)
-            writer.writerow(columns)
-            rows = zip(*(frm[c] for c in columns))
-            writer.writerows(rows)
+            if DataFrame is not None:
+                df = DataFrame({c: frm[c] for c in columns})
+                df.to_csv(buff, index=False)
+            else:
+                writer = csv.writer(buff)
+                writer.writerow(columns)
+                rows = zip(*(frm[c] for c in columns))
+                writer.writerows(rows)
             # Write generated content in pod
-            buff.seek(0)
-            pod.write(f"{series.label}.csv", buff.read().encode())
+            pod.write(f"{series.label}.csv", buff.getvalue().encode())
 
         elif file_type == "parquet":
             df = series.df()
-            data = df.to_parquet(compression="brotli")
+            data = df.to_parquet(compression="zstd")
             pod.write(f"{series.label}.parquet", data)
         else:
             exit(f'Unsupported file type "{file_type}"')
@@ -1,5 +1,3 @@
-from pathlib import Path
-
 import s3fs
 import urllib3
 
@@ -56,24 +54,54 @@ class S3POD(POD):
         logger.debug("LIST s3://%s %s", self.path, relpath)
         path = self.path / relpath
         try:
-            return [Path(p).name for p in self.fs.ls(path)]
+            # s3fs returns full keys, only keep the last component
+            return [p.rsplit("/", 1)[-1] for p in self.fs.ls(path)]
         except FileNotFoundError:
             if missing_ok:
                 return []
             raise
 
+    def walk(self, max_depth=None):
+        if max_depth == 0:
+            return []
+        logger.debug("WALK s3://%s", self.path)
+        # Use one recursive listing instead of one ls per folder,
+        # with max_depth set, s3fs stops descending at that depth
+        root = str(self.path).rstrip("/")
+        prefix = root + "/"
+        res = []
+        for key in self.fs.find(root, maxdepth=max_depth):
+            relpath = key[len(prefix) :] if key.startswith(prefix) else key
+            if max_depth is not None and relpath.count("/") >= max_depth:
+                continue
+            res.append(relpath)
+        return res
+
     def read(self, relpath, mode="rb"):
         logger.debug("READ s3://%s %s", self.path, relpath)
         path = str(self.path / relpath)
         return self.fs.open(path, mode).read()
 
+    def read_stream(self, relpath, chunk_size=4 * 1024 * 1024):
+        logger.debug("READ-STREAM s3://%s %s", self.path, relpath)
+        path = str(self.path / relpath)
+        with self.fs.open(path, "rb") as fh:
+            while True:
+                chunk = fh.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
     def write(self, relpath, data, mode="wb"):
         if self.isfile(relpath):
             logger.debug("SKIP-WRITE s3://%s %s", self.path, relpath)
             return
         logger.debug("WRITE s3://%s %s", self.path, relpath)
         path = str(self.path / relpath)
-        return self.fs.open(path, mode).write(data)
+        # pipe_file does a single PUT for small payloads and a
+        # concurrent multipart upload for large ones
+        self.fs.pipe_file(path, data)
+        return len(data)
 
     def isdir(self, relpath):
         return self.fs.isdir(self.path / relpath)
@@ -91,6 +119,24 @@ class S3POD(POD):
                 return
             raise
 
+    def rm_many(self, pathes, recursive=False, missing_ok=False):
+        pathes = [str(self.path / p) for p in pathes]
+        if not pathes:
+            return
+        logger.debug("REMOVE s3://%s (%s keys)", self.path, len(pathes))
+        try:
+            # s3fs groups keys in DeleteObjects requests
+            self.fs.rm(pathes, recursive=recursive)
+        except FileNotFoundError:
+            if not missing_ok:
+                raise
+            # Fallback to one by one deletion
+            for path in pathes:
+                try:
+                    self.fs.rm(path, recursive=recursive)
+                except FileNotFoundError:
+                    pass
+
     def mv(self, from_path, to_path, missing_ok=False):
         orig = str(self.path / from_path)
         dest = str(self.path / to_path)
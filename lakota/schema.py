@@ -48,33 +48,37 @@ class Codec:
             if dt in (dtype("O"), dtype("U")):
                 default_codec_names = ["msgpack2", "zstd"]
             self.codec_names = default_codec_names
+        # Instanciate codecs once, they only hold their configuration
+        self.codecs = [self.get_codec(name) for name in self.codec_names]
+
+    @staticmethod
+    def get_codec(codec_name):
+        codec = registry.codec_registry[codec_name]
+        kw = {}
+        if codec_name == "blosc":
+            kw = {
+                "cname": "zstd",
+                "shuffle": codec.BITSHUFFLE,
+            }
+        return codec(**kw)
 
     def encode(self, arr):
         if len(arr) == 0:
             return b""
-        # encoding may require contiguous memory
-        arr = ascontiguousarray(arr)
-        # convert to proper type
-        arr = arr.astype(self.dt)
+        # encoding may require contiguous memory, convert to proper
+        # type (both are no-op if arr is already compliant)
+        arr = ascontiguousarray(arr).astype(self.dt, copy=False)
         # Apply codecs
-        for codec_name in self.codec_names:
-            codec = registry.codec_registry[codec_name]
-            kw = {}
-            if codec_name == "blosc":
-                kw = {
-                    "cname": "zstd",
-                    "shuffle": codec.BITSHUFFLE,
-                }
-            arr = codec(**kw).encode(arr)
+        for codec in self.codecs:
+            arr = codec.encode(arr)
         return arr
 
     def decode(self, arr):
         if len(arr) == 0:
             return asarray([], dtype=self.dt)
         # Apply all codecs
-        for name in reversed(self.codec_names):
-            codec = registry.codec_registry[name]
-            arr = codec().decode(arr)
+        for codec in reversed(self.codecs):
+            arr = codec.decode(arr)
         if self.dt in ("O", "U"):
             return arr.astype(self.dt)
         return frombuffer(arr, dtype=self.dt)
@@ -82,6 +86,9 @@ class Codec:
     def __eq__(self, other):
         return self.codec_names == other.codec_names and self.dt == other.dt
 
+    def __hash__(self):
+        return hash((tuple(self.codec_names), self.dt))
+
     def __repr__(self):
         names = ", ".join(self.codec_names)
         return f"<Codec {self.dt}:{names}>"
@@ -132,7 +139,7 @@ class SchemaColumn:
         return arr
 
     def cast_scalar(self, value):
-        return dtype(self.codec.dt).type(value)
+        return self.codec.dt.type(value)
 
     def dumps(self):
         return {
@@ -44,16 +44,110 @@ $ lakota serve "local-repo file:///.lakota" "faster-bucket memory:// s3:///bucke
 expose full read and write access to the underlying repository.
 """
 
-import base64
+import struct
+from itertools import chain
 from urllib.parse import urlsplit
 
-from flask import Blueprint, Flask, request
+from flask import Blueprint, Flask, Response, request
 
 from lakota import Repo
 
 pod_bp = Blueprint(f"Lakota POD", __name__)
 
 
+def _handle_ls(repo, relpath, request):
+    try:
+        relpath = "." if relpath is None else relpath
+        names = repo.pod.ls(relpath)
+    except FileNotFoundError:
+        return f'Path "{relpath}" not found', 404
+    return {"body": names}
+
+
+def _handle_read(repo, relpath, request):
+    # Send raw bytes, the first chunk is read upfront to catch
+    # missing files
+    stream = repo.pod.read_stream(relpath)
+    try:
+        head = next(stream, b"")
+    except FileNotFoundError:
+        return f'Path "{relpath}" not found', 404
+    return Response(chain([head], stream), mimetype="application/octet-stream")
+
+
+def _handle_read_many(repo, relpath, request):
+    # Stream payloads one after the other, each one is prefixed by its
+    # length (a negative length flags a missing file)
+    pathes = request.get_json()["pathes"]
+
+    def frames():
+        for path in pathes:
+            try:
+                payload = repo.pod.read(path)
+            except FileNotFoundError:
+                yield struct.pack(">q", -1)
+                continue
+            yield struct.pack(">q", len(payload))
+            yield payload
+
+    return Response(frames(), mimetype="application/octet-stream")
+
+
+def _handle_rm(repo, relpath, request):
+    recursive = request.args.get("recursive", "").lower() == "true"
+    missing_ok = request.args.get("missing_ok", "").lower() == "true"
+    try:
+        repo.pod.rm(relpath, recursive=recursive, missing_ok=missing_ok)
+    except FileNotFoundError:
+        return f'Path "{relpath}" not found', 404
+    return {"status": "ok"}
+
+
+def _handle_mv(repo, relpath, request):
+    from_path = request.args["from_path"]
+    to_path = request.args["to_path"]
+    missing_ok = request.args.get("missing_ok", "").lower() == "true"
+
+    try:
+        repo.pod.mv(from_path, to_path, missing_ok=missing_ok)
+    except FileNotFoundError:
+        return f'Path "{from_path}" not found', 404
+    return {"status": "ok"}
+
+
+def _handle_write(repo, relpath, request):
+    try:
+        info = repo.pod.write(relpath, request.data)
+    except FileNotFoundError:
+        return f'Path "{relpath}" not found', 404
+    return {"body": info}
+
+
+def _handle_walk(repo, relpath, request):
+    pod = repo.pod
+    try:
+        if relpath:
+            pod = pod.cd(relpath)
+        max_depth = request.args.get("max_depth")
+        if max_depth is not None:
+            max_depth = int(max_depth)
+        names = list(pod.walk(max_depth=max_depth))
+    except FileNotFoundError:
+        return f'Path "{relpath}" not found', 404
+    return {"body": names}
+
+
+ACTIONS = {
+    "ls": _handle_ls,
+    "read": _handle_read,
+    "read_many": _handle_read_many,
+    "rm": _handle_rm,
+    "mv": _handle_mv,
+    "write": _handle_write,
+    "walk": _handle_walk,
+}
+
+
 @pod_bp.route("/<action>", methods=["GET", "POST"])
 def pod(repo, action, relpath=None):
     """
@@ -65,7 +159,7 @@ def pod(repo, action, relpath=None):
         schema:
           type: string
         required: true
-        description: Action to perform (ls, read, rm or walk)
+        description: Action to perform (ls, read, read_many, rm, mv, write or walk)
       - in: path
         name: relpath
         schema:
@@ -73,65 +167,11 @@ def pod(repo, action, relpath=None):
         required: false
         description: Relative path
     """
+    handler = ACTIONS.get(action)
+    if handler is None:
+        return f'Action "{action}" not supported', 404
     relpath = request.args.get("path")
-    if action == "ls":
-        try:
-            relpath = "." if relpath is None else relpath
-            names = repo.pod.ls(relpath)
-        except FileNotFoundError:
-            return 'Path "{relpath}" not found', 404
-        return {"body": names}
-
-    elif action == "read":
-        try:
-            payload = repo.pod.read(relpath)
-            payload = base64.b64encode(payload).decode("ascii")
-        except FileNotFoundError:
-            return 'Path "{relpath}" not found', 404
-        return {"body": payload, "b64encoded": True}
-
-    elif action == "rm":
-        recursive = request.args.get("recursive", "").lower() == "true"
-        missing_ok = request.args.get("missing_ok", "").lower() == "true"
-        try:
-            repo.pod.rm(relpath, recursive=recursive, missing_ok=missing_ok)
-        except FileNotFoundError:
-            return 'Path "{relpath}" not found', 404
-        return {"status": "ok"}
-
-    elif action == "mv":
-        from_path = request.args["from_path"]
-        to_path = request.args["to_path"]
-        missing_ok = request.args.get("missing_ok", "").lower() == "true"
-
-        try:
-            repo.pod.mv(from_path, to_path, missing_ok=missing_ok)
-        except FileNotFoundError:
-            return 'Path "{from_path}" not found', 404
-        return {"status": "ok"}
-
-    elif action == "write":
-        try:
-            info = repo.pod.write(relpath, request.data)
-        except FileNotFoundError:
-            return 'Path "{relpath}" not found', 404
-        return {"body": info}
-
-    elif action == "walk":
-        pod = repo.pod
-        try:
-            if relpath:
-                pod = pod.cd(relpath)
-            max_depth = request.args.get("max_depth")
-            if max_depth is not None:
-                max_depth = int(max_depth)
-            names = list(pod.walk(max_depth=max_depth))
-        except FileNotFoundError:
-            return 'Path "{relpath}" not found', 404
-        return {"body": names}
-
-    else:
-        return 'Action "{action}" not supported', 404
+    return handler(repo, relpath, request)
 
 
 def index(prefixes):
@@ -47,10 +47,23 @@ max_new_cases-> [22210]
 
 import operator
 import shlex
-from functools import reduce
+from functools import lru_cache, reduce
 
 import numpy
-from numpy import bincount, inf, max, maximum, mean, min, minimum, quantile, repeat, sum
+from numpy import (
+    bincount,
+    inf,
+    isin,
+    max,
+    maximum,
+    mean,
+    min,
+    minimum,
+    ndarray,
+    quantile,
+    repeat,
+    sum,
+)
 
 __all__ = ["AST"]
 
@@ -63,6 +76,20 @@ def list_to_dict(*items):
     return dict(zip(it, it))
 
 
+def variadic(op):
+    """
+    Wrap binary `op` to accept any number of arguments, the common
+    binary case is called directly.
+    """
+
+    def fn(*x):
+        if len(x) == 2:
+            return op(*x)
+        return reduce(op, x)
+
+    return fn
+
+
 class KWargs:
     def __init__(self, *items):
         self.value = list_to_dict(*items)
@@ -75,47 +102,67 @@ class Env:
             values = values.values
         self.values = values
 
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def accessor(key):
+        """
+        Return a function that resolves `key` against a values
+        object, the dotted key is only split once.
+        """
+        parts = key.split(".")
+
+        def get(res, default=UNSET):
+            for part in parts:
+                try:
+                    res = getattr(res, part)
+                except AttributeError:
+                    pass
+                try:
+                    res = res[part]
+                except KeyError:
+                    if default is not UNSET:
+                        return default
+                    raise
+            return res
+
+        return get
+
     def get(self, key, default=UNSET):
-        res = self.values
-        for part in key.split("."):
-            try:
-                res = getattr(res, part)
-            except AttributeError:
-                pass
-            try:
-                res = res[part]
-            except KeyError:
-                if default is not UNSET:
-                    return default
-                raise
-        return res
+        return self.accessor(key)(self.values, default)
 
 
 class Token:
     def __init__(self, value):
         self.value = value
+        # Classify token once: kind is one of "int", "float", "str" or
+        # "ident", payload is the corresponding python value
+        self.kind, self.payload = self.classify(value)
 
-    def as_string(self):
-        res = self.value.strip("'\"")
-        if len(res) < len(self.value):
-            return res
-        return None
-
-    def __repr__(self):
-        return f"<Token {self.value}>"
-
-    def as_number(self):
+    @staticmethod
+    def classify(value):
         try:
-            return int(self.value)
+            return "int", int(value)
         except ValueError:
             pass
 
         try:
-            return float(self.value)
+            return "float", float(value)
         except ValueError:
             pass
 
-        return None
+        res = value.strip("'\"")
+        if len(res) < len(value):
+            return "str", res
+        return "ident", value
+
+    def as_string(self):
+        return self.payload if self.kind == "str" else None
+
+    def __repr__(self):
+        return f"<Token {self.value}>"
+
+    def as_number(self):
+        return self.payload if self.kind in ("int", "float") else None
 
     def is_aggregate(self):
         return self.value in AST.aggregates
@@ -127,14 +174,9 @@ class Token:
         # Eval aggregates
         if self.is_aggregate():
             return Agg(self.value, env)
-        # Eval floats and int
-        res = self.as_number()
-        if res is not None:
-            return res
-        # Eval strings
-        res = self.as_string()
-        if res is not None:
-            return res
+        # Eval floats, int and strings
+        if self.kind != "ident":
+            return self.payload
         # Eval env
         try:
             return env.get(self.value)
@@ -147,6 +189,37 @@ class Token:
 
         raise ValueError(f'Unexpected token: "{self.value}"')
 
+    def compile(self):
+        """
+        Return a function of `env` equivalent to `self.eval`, with
+        builtins, literals and numpy functions resolved once.
+        """
+        value = self.value
+        if value in AST.builtins:
+            res = AST.builtins[value]
+            return lambda env: res
+        if self.is_aggregate():
+            return lambda env: Agg(value, env)
+        if self.kind != "ident":
+            res = self.payload
+            return lambda env: res
+
+        # Env has precedence over numpy, so only the numpy lookup
+        # can be done upfront
+        fn = getattr(numpy, value, None)
+        get = Env.accessor(value)
+
+        def lookup(env):
+            try:
+                return get(env.values)
+            except KeyError:
+                pass
+            if fn:
+                return fn
+            raise ValueError(f'Unexpected token: "{value}"')
+
+        return lookup
+
 
 class Agg:
     def __init__(self, op, env):
@@ -221,48 +294,79 @@ class Alias:
         self.name = name
 
 
+_WORDCHARS = shlex.shlex("").wordchars + ".!=<>:{}-"
+
+
 def tokenize(expr):
     lexer = shlex.shlex(expr)
-    lexer.wordchars += ".!=<>:{}-"
+    lexer.wordchars = _WORDCHARS
     for i in lexer:
         yield Token(i)
 
 
-def scan(tokens, end_tk=")"):
-    res = []
+def scan(tokens):
+    # Iterative parsing: `stack` contains the lists currently open
+    stack = [[]]
     for tk in tokens:
-        if tk.value == end_tk:
-            return res
-        elif tk.value == "(":
-            res.append(scan(tokens))
+        if tk.value == "(":
+            stack.append([])
+        elif tk.value == ")":
+            if len(stack) == 1:
+                break
+            top = stack.pop()
+            stack[-1].append(top)
         else:
-            res.append(tk)
+            stack[-1].append(tk)
 
-    tail = next(tokens, None)
-    if tail:
-        raise ValueError(f'Unexpected token: "{tail.value}"')
-    return res
+    # Close unbalanced lists
+    while len(stack) > 1:
+        top = stack.pop()
+        stack[-1].append(top)
+    return stack[0]
+
+
+def compile_tokens(tokens):
+    if isinstance(tokens, Token):
+        return tokens.compile()
+    head = compile_tokens(tokens[0])
+    args = [compile_tokens(tk) for tk in tokens[1:]]
+
+    def call(env):
+        # Split normal and kw args
+        simple_args = []
+        kw_args = {}
+        for arg in args:
+            a = arg(env)
+            if isinstance(a, KWargs):
+                kw_args.update(a.value)
+            else:
+                simple_args.append(a)
+
+        fn = head(env)
+        return fn(*simple_args, **kw_args)
+
+    return call
 
 
 class AST:
     builtins = {
         "true": True,
         "false": False,
-        "+": lambda *x: reduce(operator.add, x),
-        "-": lambda *x: reduce(operator.sub, x),
-        "*": lambda *x: reduce(operator.mul, x),
-        "/": lambda *x: reduce(operator.truediv, x),
-        "%": lambda *x: reduce(operator.mod, x),
-        "and": lambda *x: reduce(operator.and_, x),
-        "or": lambda *x: reduce(operator.or_, x),
-        "<": lambda *x: reduce(operator.lt, x),
-        "<=": lambda *x: reduce(operator.le, x),
-        "=": lambda *x: reduce(operator.eq, x),
-        "!=": lambda *x: reduce(operator.ne, x),
-        ">=": lambda *x: reduce(operator.ge, x),
-        ">": lambda *x: reduce(operator.gt, x),
+        "+": variadic(operator.add),
+        "-": variadic(operator.sub),
+        "*": variadic(operator.mul),
+        "/": variadic(operator.truediv),
+        "%": variadic(operator.mod),
+        "and": variadic(operator.and_),
+        "or": variadic(operator.or_),
+        "<": variadic(operator.lt),
+        "<=": variadic(operator.le),
+        "=": variadic(operator.eq),
+        "!=": variadic(operator.ne),
+        ">=": variadic(operator.ge),
+        ">": variadic(operator.gt),
         "~": lambda *xs: all(not x for x in xs),
-        "in": lambda *x: x[0] in x[1],
+        "in": lambda x, y: isin(x, y) if isinstance(x, ndarray) else x in y,
         "list": lambda *x: list(x),
         "as": lambda *x: Alias(x[0], x[1]),
         "dict": list_to_dict,
@@ -284,31 +388,32 @@ class AST:
 
     def __init__(self, tokens):
         self.tokens = tokens
+        self._compiled = None
 
     @classmethod
+    @lru_cache(maxsize=1024)
     def parse(cls, expr):
         res = tokenize(expr)
         tokens = scan(res)[0]
         return AST(tokens)
 
-    def eval(self, env=None):
-        env = Env(env or {})
-        if isinstance(self.tokens, Token):
-            return self.tokens.eval(env)
-        head, tail = self.tokens[0], self.tokens[1:]
-        args = [AST(tk).eval(env) for tk in tail]
+    @classmethod
+    @lru_cache(maxsize=256)
+    def parse_compiled(cls, expr):
+        """
+        Parse and compile `expr`, return a function that takes an
+        optional `env` parameter (like `AST.eval`)
+        """
+        return cls.parse(expr).compile()
 
-        # Split normal and kw args
-        simple_args = []
-        kw_args = {}
-        for a in args:
-            if isinstance(a, KWargs):
-                kw_args.update(a.value)
-            else:
-                simple_args.append(a)
+    def compile(self):
+        fn = compile_tokens(self.tokens)
+        return lambda env=None: fn(Env(env or {}))
 
-        fn = head.eval(env)
-        return fn(*simple_args, **kw_args)
+    def eval(self, env=None):
+        if self._compiled is None:
+            self._compiled = self.compile()
+        return self._compiled(env)
 
     def is_aggregate(self):
         for tk in self.tokens:
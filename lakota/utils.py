@@ -37,6 +37,7 @@ class Settings:
     page_len: int
     squash_max_chunk: int
     timeout: int
+    column_cache_size: int
 
 
 settings = Settings(
@@ -47,6 +48,7 @@ settings = Settings(
     page_len=500_000,
     squash_max_chunk=4,  # Max number of small chunks in a series
     timeout=600,  # Max duration for a write batch (in seconds)
+    column_cache_size=64 * 1024 * 1024,  # Max size of column cache (in bytes)
 )
 
 
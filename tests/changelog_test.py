@@ -108,3 +108,15 @@ def test_leafs():
 
     # Last writes wins
     assert changelog.leaf().read() == b"bar"
+
+
+def test_log_cache(pod):
+    changelog = Changelog(pod)
+    populate(changelog, datum)
+    cached = [r.path for r in changelog.log()]
+    assert changelog.leaf().is_leaf
+
+    # A fresh changelog must see the same history
+    fresh = Changelog(pod)
+    assert [r.path for r in fresh.log()] == cached
+    assert [r.is_leaf for r in fresh.log()] == [r.is_leaf for r in changelog.log()]
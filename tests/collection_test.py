@@ -327,4 +327,45 @@ def test_multi_batch():
     assert not temperature.series("Brussels").frame().empty
 
 
+def test_multi_write_order():
+    repo = Repo()
+    temperature = repo.create_collection(schema, "temperature")
+    with temperature.multi():
+        # Appended labels
+        for label in ("Brussels", "London", "Paris"):
+            temperature.series(label).write(frame)
+        # Overwrite of an existing row
+        london = {"timestamp": frame["timestamp"][1:], "value": [22, 23]}
+        temperature.series("London").write(london)
+        # Label inserted before the tail
+        temperature.series("Amsterdam").write(frame)
+
+    assert len(temperature.changelog.log()) == 1
+    assert temperature.ls() == ["Amsterdam", "Brussels", "London", "Paris"]
+    assert temperature.series("Paris").frame() == frame
+    assert list(temperature.series("London").frame()["value"]) == [11, 22, 23]
+
+
+@pytest.mark.parametrize("multi", [True, False])
+@pytest.mark.parametrize("labels", [("a", "b"), ("b", "a")])
+def test_touching_labels(multi, labels):
+    repo = Repo()
+    temperature = repo.create_collection(schema, "temperature")
+    frames = {
+        "a": {"timestamp": frame["timestamp"][:2], "value": [1, 2]},
+        "b": {"timestamp": frame["timestamp"][1:], "value": [3, 4]},
+    }
+    if multi:
+        with temperature.multi():
+            for label in labels:
+                temperature.series(label).write(frames[label])
+    else:
+        for label in labels:
+            temperature.series(label).write(frames[label])
+
+    assert temperature.ls() == ["a", "b"]
+    for label in labels:
+        assert temperature.series(label).frame() == frames[label]
+
+
 ## TODO test of schema update of existing collection
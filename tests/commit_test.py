@@ -0,0 +1,112 @@
+import pytest
+from numpy.random import default_rng
+
+from lakota import Repo, Schema
+from lakota.commit import ColumnCache, Commit, column_cache
+from lakota.utils import hashed_path, settings
+
+schema = Schema(timestamp="int*", value="float")
+frm = {
+    "timestamp": list(range(1000)),
+    "value": default_rng(0).random(1000),
+}
+
+
+@pytest.fixture
+def series():
+    repo = Repo("memory://")
+    clct = repo.create_collection(schema, "clct")
+    series = clct / "srs"
+    # Random values, so that encoded value column is too large to be
+    # embedded in the commit
+    series.write(frm)
+    column_cache.clear()
+    return series
+
+
+def test_column_cache(series, monkeypatch):
+    assert series.frame() == frm
+    assert len(column_cache.arrays) == 1
+
+    # Second read is served from the cache, without touching the pod
+    def fail(*a, **kw):
+        raise AssertionError("Cache miss")
+
+    monkeypatch.setattr(type(series.pod), "read", fail)
+    assert series.frame() == frm
+
+
+def test_column_cache_size(series, monkeypatch):
+    # Array is too large to be cached
+    monkeypatch.setattr(settings, "column_cache_size", 4000)
+    assert series.frame() == frm
+    assert len(column_cache.arrays) == 0
+
+    # Least recently used arrays are evicted first
+    cache = ColumnCache()
+    for key in "abc":
+        cache.set(key, frm["value"][:200])  # 1600 bytes each
+    assert list(cache.arrays) == ["b", "c"]
+    assert cache.get("b") is not None
+    cache.set("d", frm["value"][:200])
+    assert list(cache.arrays) == ["b", "d"]
+    assert cache.nbytes == 3200
+
+
+def test_read_soft_deleted(series):
+    ci = series.changelog.leaf().commit(series.collection)
+    folder, filename = hashed_path(ci.digest["value"][0])
+    path = str(folder / filename)
+    series.pod.mv(path, path + ".00000000000")
+    assert series.frame() == frm
+
+
+def apply_rows(ci, rows):
+    for row in rows:
+        ci = ci.update(*row)
+    return ci
+
+
+@pytest.mark.parametrize("order", ["sorted", "overlap", "unsorted"])
+def test_update_many(order):
+    rows = [
+        ("a", (0,), (10,), ("d1", "d2"), 10, "b", None),
+        ("a", (11,), (20,), ("d3", "d4"), 10, "b", None),
+        ("b", (0,), (5,), ("d5", "d6"), 5, "b", None),
+        ("b", (6,), (9,), ("d7", "d8"), 4, "b", None),
+    ]
+    if order == "overlap":
+        rows += [
+            ("a", (5,), (15,), ("d9", "d10"), 11, "b", None),
+            ("b", (6,), (9,), ("d11", "d12"), 4, "l", None),
+            ("c", (0,), (1,), ("d13", "d14"), 2, "b", None),
+        ]
+    elif order == "unsorted":
+        rows = rows[::-1] + [
+            ("a", (30,), (40,), ("d9", "d10"), 11, "b", None),
+            ("a", (21,), (25,), ("d11", "d12"), 5, "r", None),
+        ]
+
+    first = Commit.one(schema, "a", (-10,), (-5,), ("d0", "d0"), 6)
+    expected = apply_rows(first, rows)
+    res = first.update_many(rows)
+    assert res.encode() == expected.encode()
+    assert res.label.tolist() == expected.label.tolist()
+
+
+@pytest.mark.parametrize("reverse", [True, False])
+def test_update_many_touching_labels(reverse):
+    # The range of "b" starts where the one of "a" stops
+    rows = [
+        ("a", (1,), (2,), ("d1", "d2"), 2, "b", None),
+        ("b", (2,), (3,), ("d3", "d4"), 2, "b", None),
+    ]
+    if reverse:
+        rows = rows[::-1]
+
+    first = Commit.one(schema, "0", (0,), (1,), ("d0", "d0"), 2)
+    expected = apply_rows(first, rows)
+    res = first.update_many(rows)
+    assert res.encode() == expected.encode()
+    # No row is overshadowed
+    assert res.label.tolist() == ["0", "a", "b"]
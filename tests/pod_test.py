@@ -173,3 +173,61 @@ def test_mempod_lru():
     # A swap was triggered, the data is already in back:
     assert pod.store.back_kv["/", "0"]
     assert pod.read("0") == large_data
+
+
+def test_read_many(pod):
+    pod.write("key", deadbeef)
+    pod.write("ham/key", b"spam")
+    assert pod.read_many(["key", "ham/key"]) == [deadbeef, b"spam"]
+    with pytest.raises(FileNotFoundError):
+        pod.read_many(["key", "missing"])
+
+
+def test_read_stream(pod):
+    pod.write("key", deadbeef)
+    assert b"".join(pod.read_stream("key", chunk_size=3)) == deadbeef
+    # Http pod goes through the server streamed response
+    assert pod.read("key") == deadbeef
+
+
+def test_cache_write_back():
+    local = POD.from_uri("memory://")
+    remote = POD.from_uri("memory://")
+    pod = CachePOD(local, remote)
+    remote.write("ham/spam", deadbeef)
+
+    # Remote payload is returned and copied in local
+    assert pod.cd("ham").read("spam") == deadbeef
+    pod.flush()
+    assert local.read("ham/spam") == deadbeef
+    assert pod.read("ham/spam") == deadbeef
+
+
+def test_cache_write_back_error():
+    local = POD.from_uri("memory://")
+    remote = POD.from_uri("memory://")
+    pod = CachePOD(local, remote)
+    remote.write("spam", deadbeef)
+    remote.write("ham", deadbeef)
+
+    local_write = local.write
+
+    def fail(relpath, data, mode="wb"):
+        if relpath == "spam":
+            raise OSError("Disk full")
+        return local_write(relpath, data, mode=mode)
+
+    local.write = fail
+    # Failed write-back is not fatal
+    assert pod.read("spam") == deadbeef
+    assert pod.read("ham") == deadbeef
+    pod.flush()
+    assert not local.isfile("spam")
+    assert local.isfile("ham")
+
+    # Both sides are cleaned
+    pod.rm("ham")
+    pod.rm("spam")
+    for p in (local, remote, pod):
+        assert not p.isfile("spam")
+        assert not p.isfile("ham")
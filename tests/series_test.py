@@ -379,6 +379,19 @@ def test_rev_filter(series):
     assert old_frm == orig_frm
 
 
+def test_parent_embedded(series):
+    parent_rev = series.changelog.leaf()
+    parent_ci = parent_rev.commit(series.collection)
+    embedded = dict(parent_ci.embedded)
+
+    series.write({"timestamp": [1589455906], "value": [6.6]})
+    series.write({"timestamp": [1589455907], "value": [7.7]})
+
+    # The cached commit of the parent revision is not modified
+    assert parent_rev.commit(series.collection).embedded == embedded
+    assert series.frame()["value"][-2:].tolist() == [6.6, 7.7]
+
+
 @pytest.mark.parametrize("extra_commit", [True, False])
 def test_paginate(series, extra_commit):
     ts = orig_frm["timestamp"]
@@ -130,3 +130,9 @@ def test_alias():
     frm = Frame(schema, values)
     frm = frm.reduce("(as self.timestamp 'ts')")
     assert all(frm["ts"] == asarray(values["timestamp"], "M"))
+
+
+def test_in_array():
+    arr = asarray([1, 2, 3])
+    res = AST.parse("(in arr (list 1 3))").eval({"arr": arr})
+    assert all(res == asarray([True, False, True]))